@@ -1,6 +1,17 @@
-import json
 import os
 import datetime
+import pickle
+from collections import Counter
+
+try:
+    # orjson is much faster to parse and serialize the leaderboards, but it is optional
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    _json_loads = json.loads
+    _json_dumps = lambda obj: json.dumps(obj).encode('utf-8')
 
 from .song import Song
 from .score import Score
@@ -17,15 +28,16 @@ class History:
         :type folder: string
         :rtype: a LeaderBoard instance
         """
-        filenames = []
-        for filename in sorted(os.listdir(folder)):
-            filename = os.path.join(folder, filename)
-            if os.path.isfile(filename) and os.path.splitext(filename)[1] == '.dat':
-                filenames.append(filename)
-        return LeaderBoard.load(filenames[-1])
+        with os.scandir(folder) as it:
+            entries = [entry for entry in it if entry.is_file() and os.path.splitext(entry.name)[1] == '.dat']
+        entries.sort(key=lambda entry: entry.name)
+        return LeaderBoard.load(entries[-1].path)
 
 class Backup:
     DEFAULT_FOLDER = 'backups'
+    CACHE_FILENAME = '.merged.pkl'
+    # To change when the pickled classes change
+    CACHE_VERSION = 1
     
 class LeaderBoard:
     """ A BeatSaber LeaderBoard with songs and all the corresponding scores.
@@ -38,6 +50,26 @@ class LeaderBoard:
         
         # Cache
         self.__song_pos = {song.get_leaderboardId(): i for i, song in enumerate(songs)}
+        # IDs of the songs copied by a merge in this LeaderBoard:
+        #   they are not shared, so they can be extended in place.
+        self.__merged_ids = set()
+
+    @classmethod
+    def _with_song_pos(cl, songs, song_pos):
+        """ Return a LeaderBoard with the given songs, when the position of each song
+        is already known. It avoids to index again all the songs.
+
+        :param songs: list of the songs of the LeaderBoard
+        :type songs: list of Song instances
+        :param song_pos: the dictionary which associates each song ID with its position in ``songs``
+        :type song_pos: dict{string => integer}
+        :rtype: a LeaderBoard instance
+        """
+        lb = cl.__new__(cl)
+        lb._leaderboardsData = songs
+        lb.__song_pos = song_pos
+        lb.__merged_ids = set()
+        return lb
 
     @classmethod
     def pull(cl):
@@ -77,8 +109,8 @@ class LeaderBoard:
         :type filename: string
         :rtype: a LeaderBoard instance
         """
-        with open(filename, 'r') as _file:
-            obj = json.loads(_file.read())
+        with open(filename, 'rb') as _file:
+            obj = _json_loads(_file.read())
             return cl.from_json(obj)
     
     @classmethod
@@ -91,23 +123,118 @@ class LeaderBoard:
         :type correct_extensions: list of strings
         :rtype: a LeaderBoard instance
         """
+        entries = cl._list_dir(dirname, correct_extensions)
+        return cl._load_files([entry.path for entry in entries])
+
+    @classmethod
+    def _list_dir(cl, dirname, correct_extensions):
+        """ Return the entries of the LeaderBoard files of a directory.
+
+        :rtype: list of os.DirEntry instances
+        """
+        entries = []
+        with os.scandir(dirname) as it:
+            for entry in it:
+                if entry.is_file():
+                    _, extension = os.path.splitext(entry.name)
+                    if extension in correct_extensions:
+                        entries.append(entry)
+        return entries
+
+    @classmethod
+    def _load_files(cl, filenames):
+        """ Return the BeatSaber LeaderBoard represented by all the given files.
+
+        :rtype: a LeaderBoard instance
+        """
+        # All the songs are merged in a single LeaderBoard
         global_leaderboard = cl([])
-        for filename in os.listdir(dirname):
-            filename = os.path.join(dirname, filename)
-            if os.path.isfile(filename):
-                _, extension = os.path.splitext(filename)
-                if extension in correct_extensions:
-                    global_leaderboard += cl.load_file(filename)
+        for filename in filenames:
+            global_leaderboard.add_songs(cl.load_file(filename).get_songs())
         return global_leaderboard
 
+    @classmethod
+    def load_stream(cl, filename):
+        """ Return the BeatSaber LeaderBoard represented by a log of scores,
+        as written by ``append_delta``. The file is read line by line.
+
+        :param filename: the file name of the log
+        :type filename: string
+        :rtype: a LeaderBoard instance
+        """
+        scores = {}
+        with open(filename, 'rb') as _file:
+            for line in _file:
+                if line.strip():
+                    obj = _json_loads(line)
+                    scores.setdefault(obj['id'], []).append(Score.from_json(obj['score']))
+        return cl([Song(id, song_scores) for id, song_scores in scores.items()])
+
     @classmethod
     def load_from_backup(cl):
-        """ Return the BeatSaber LeaderBoard represented by all the files of the backup directory.
-        The backup directory is given by ``Backup.DEFAULT_FOLDER``.
+        """ Return the BeatSaber LeaderBoard represented by all the files of the backup directory:
+        the saved LeaderBoards (".dat" files), then the logs of scores written by ``append_delta``
+        (".ndjson" files) on top of them. The backup directory is given by ``Backup.DEFAULT_FOLDER``.
+
+        :rtype: a LeaderBoard instance
+        """
+        return cl._load_backup(cl._list_dir(Backup.DEFAULT_FOLDER, ['.dat', '.ndjson']))
+
+    @classmethod
+    def _load_backup(cl, entries):
+        """ Return the BeatSaber LeaderBoard represented by the given files of the backup directory.
+        The logs of scores are merged on top of the saved LeaderBoards.
+
+        :rtype: a LeaderBoard instance
+        """
+        snapshots = [entry.path for entry in entries if os.path.splitext(entry.name)[1] == '.dat']
+        logs = sorted(entry.path for entry in entries if os.path.splitext(entry.name)[1] == '.ndjson')
+
+        leaderboard = cl._load_files(snapshots)
+        for filename in logs:
+            leaderboard.add_songs(cl.load_stream(filename).get_songs())
+        return leaderboard
+
+    @classmethod
+    def load_from_backup_cached(cl, cache_path=None):
+        """ Return the BeatSaber LeaderBoard represented by all the files of the backup directory,
+        as ``load_from_backup``. The merged LeaderBoard is saved in a cache file, and it is reused
+        as long as no file of the backup has been added, removed or modified.
 
+        :param cache_path: the file name of the cache, by default ".merged.pkl" in the backup directory
+        :type cache_path: string
         :rtype: a LeaderBoard instance
         """
-        return cl.load_dir(Backup.DEFAULT_FOLDER)
+        if cache_path is None:
+            cache_path = os.path.join(Backup.DEFAULT_FOLDER, Backup.CACHE_FILENAME)
+
+        entries = cl._list_dir(Backup.DEFAULT_FOLDER, ['.dat', '.ndjson'])
+        signature = []
+        for entry in entries:
+            stat = entry.stat()
+            signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        signature.sort()
+        header = (Backup.CACHE_VERSION, signature)
+
+        # The header is stored before the LeaderBoard, so
+        #   an outdated cache is detected without loading it.
+        try:
+            with open(cache_path, 'rb') as _file:
+                if pickle.load(_file) == header:
+                    leaderboard = pickle.load(_file)
+                    if isinstance(leaderboard, cl):
+                        return leaderboard
+        except Exception:
+            # Missing, corrupted or incompatible cache: it is rebuilt
+            pass
+
+        leaderboard = cl._load_backup(entries)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as _file:
+            pickle.dump(header, _file)
+            pickle.dump(leaderboard, _file)
+        os.replace(tmp_path, cache_path)
+        return leaderboard
 
     def save(self, filename=None, must_be_valid=True):
         """ Save the LeaderBoard in a file. If no filename is given, it will save the
@@ -124,8 +251,8 @@ class LeaderBoard:
             assert not must_be_valid or self.is_valid()
             #assert not os.path.exists(filename), 'Already exists!'
             
-            with open(filename, 'w') as _file:
-                _file.write(json.dumps(self.to_json()))
+            with open(filename, 'wb') as _file:
+                _file.write(_json_dumps(self.to_json()))
     
     def save_in_backup(self):
         """ Save the LeaderBoard in the backup. It will create a new file in the backup directory,
@@ -137,6 +264,30 @@ class LeaderBoard:
             os.mkdir(Backup.DEFAULT_FOLDER)
         self.save(os.path.join(Backup.DEFAULT_FOLDER, filename), must_be_valid=False)
         
+    def append_delta(self, song_id, score, filename=None):
+        """ Add a score in the LeaderBoard and append it at the end of a log of scores,
+        with one JSON record per line. It is much cheaper than saving the whole LeaderBoard,
+        the log can be read with ``load_stream``. If no filename is given, the score is appended
+        to the log of the day in the backup directory, with the name "%Y-%m-%d_LocalLeaderboards.ndjson".
+        This operation modifies the current object.
+
+        :param song_id: the ID of the song of the score
+        :type song_id: string
+        :param score: the added score
+        :type score: a Score instance
+        :param filename: the file name of the log, optional
+        :type filename: string
+        """
+        self.add_song(Song(song_id, [score]))
+
+        if filename is None:
+            now = datetime.datetime.now()
+            filename = os.path.join(Backup.DEFAULT_FOLDER, now.strftime('%Y-%m-%d_LocalLeaderboards.ndjson'))
+            if not os.path.exists(Backup.DEFAULT_FOLDER):
+                os.mkdir(Backup.DEFAULT_FOLDER)
+        with open(filename, 'ab') as _file:
+            _file.write(_json_dumps({'id': song_id, 'score': score.to_json()}) + b'\n')
+        
     ### Getters
     def get_songs(self):
         """ Return the list of songs of the LeaderBoard (with all the scores)
@@ -177,15 +328,10 @@ class LeaderBoard:
 
         :rtype: dict{string => integer}
         """
-        players = {}
+        players = Counter()
         for song in self._leaderboardsData:
-            song_players = song.get_players()
-            for name, number in song_players.items():
-                try:
-                    players[name] += number
-                except KeyError:
-                    players[name] = number
-        return players
+            players.update(song.get_players())
+        return dict(players)
     
     ### Setters
     def rename_player(self, old, new):
@@ -269,25 +415,34 @@ class LeaderBoard:
         :param songs: the list of the added songs
         :type songs: list of Song instances
         """
-        # Get the list of scores
-        try:
-            _ = (e for e in songs)
-            assert len(args) == 0, 'If the first argument is iterable, it must be the only argument.'
-        except TypeError:
+        # Get the list of songs
+        if isinstance(songs, Song):
             songs = [songs] + list(args)
-        # Checking
-        for song in songs:
-            assert isinstance(song, Song)
+        else:
+            assert len(args) == 0, 'If the first argument is iterable, it must be the only argument.'
+            if not isinstance(songs, (list, tuple)):
+                songs = list(songs)
+        # Checking (skipped with "python -O")
+        if __debug__:
+            for song in songs:
+                assert isinstance(song, Song)
         # Adding
         for song in songs:
             id = song.get_leaderboardId()
             try:
                 pos = self.__song_pos[id]
                 csong = self._leaderboardsData[pos]
-                self._leaderboardsData[pos] = csong + song
+                if id not in self.__merged_ids:
+                    csong = csong._copy()
+                    self._leaderboardsData[pos] = csong
+                    self.__merged_ids.add(id)
+                csong.add_scores(song._scores)
             except KeyError:
-                self._leaderboardsData.append(song)
-                self.__song_pos[id] = len(self._leaderboardsData)-1        
+                # The song may still be extended in place by its LeaderBoard,
+                #   so a copy is kept.
+                self._leaderboardsData.append(song._copy())
+                self.__song_pos[id] = len(self._leaderboardsData)-1
+                self.__merged_ids.add(id)
     
     def add_song(self, song):
         """ Add a Song instance in the LeaderBoard.
@@ -305,7 +460,10 @@ class LeaderBoard:
 
         :rtype: a LeaderBoard instance
         """
-        lb = LeaderBoard(self.get_songs())
+        lb = LeaderBoard._with_song_pos(list(self._leaderboardsData), dict(self.__song_pos))
+        # The songs are now shared with the new LeaderBoard,
+        #   so they must not be extended in place anymore.
+        self.__merged_ids.clear()
         lb.add_songs(other.get_songs())
         return lb
 
@@ -1,4 +1,5 @@
 import datetime
+import sys
 
 class Score:
     """ A BeatSaber Score.
@@ -12,6 +13,8 @@ class Score:
     :param timestamp: the timestamp when the player obtained this score, optional
     :type timestamp: integer
     """
+    __slots__ = ('_score', '_playerName', '_fullCombo', '_timestamp', '_sort_key')
+
     def __init__(self, score, player, fullCombo=False, timestamp=None):
         # Some checking
         assert type(score) is int
@@ -20,9 +23,11 @@ class Score:
         assert type(timestamp) is int or (timestamp is None)
 
         self._score = score
-        self._playerName = player
+        # The same names appear in many scores, so they are interned
+        self._playerName = sys.intern(player)
         self._fullCombo = fullCombo
         self._timestamp = timestamp or self.get_current_timestamp()
+        self._update_sort_key()
     
     @classmethod
     def get_current_timestamp(cl):
@@ -40,48 +45,36 @@ class Score:
     
     ### Setters
     def rename_player(self, name):
-        self._playerName = name
+        self._playerName = sys.intern(name)
+        self._update_sort_key()
+    
+    ### Utility
+    def _update_sort_key(self):
+        """ Compute the key used to sort the scores: the best scores first,
+        then the full combos, then the oldest ones, then by player name.
+        """
+        self._sort_key = (-self._score, -self._fullCombo, self._timestamp, self._playerName)
     
     ### Comparison operators
+    # All the comparisons are done on the sort key:
+    #   Better score => Full Combo => Time Before => Name Before
     def __eq__(self, other):
-        return (self._score == other._score) \
-            and (self._fullCombo == other._fullCombo) \
-            and (self._timestamp == other._timestamp) \
-            and (self._playerName == other._playerName)
+        return self._sort_key == other._sort_key
 
     def __ne__(self, other):
-        return not (self == other)
+        return self._sort_key != other._sort_key
     
     def __lt__(self, other):
-        # Better score => Before
-        if (self._score > other._score):
-            return True
-        elif (self._score < other._score):
-            return False
-
-        # Full Combo => Before
-        if (self._fullCombo > other._fullCombo):
-            return True
-        elif (self._fullCombo < other._fullCombo):
-            return False
-
-        # Time Before => Before
-        if (self._timestamp < other._timestamp):
-            return True
-        if (self._timestamp > other._timestamp):
-            return False
-
-        # Name Before => Before
-        return (self._playerName < other._playerName)
+        return self._sort_key < other._sort_key
         
     def __le__(self, other):
-        return (self < other) or (self == other)
+        return self._sort_key <= other._sort_key
 
     def __gt__(self, other):
-        return  not (self <= other)
+        return self._sort_key > other._sort_key
     
     def __ge__(self, other):
-        return not (self < other)
+        return self._sort_key >= other._sort_key
     
     ### Display functions
     def __str__(self):
@@ -1,3 +1,9 @@
+import bisect
+import operator
+import re
+import sys
+from collections import Counter
+
 from .score import Score
 
 
@@ -13,6 +19,15 @@ class Level:
         return [Level.EASY, Level.NORMAL, Level.HARD, Level.EXPERT, Level.EXPERT_PLUS]
 
 
+# A song ID is "Quest" + the song title + the song level
+_LEADERBOARD_ID_RE = re.compile(r'^(?:Quest)?(.*?)({})$'.format(
+    '|'.join(re.escape(lvl) for lvl in sorted(Level.get_all(), key=len, reverse=True))
+))
+# The same song IDs appear in all the LeaderBoards,
+#   so their parsing is memoized.
+_LEADERBOARD_ID_CACHE = {}
+
+
 class Song:
     """ A BeatSaber Song with all the scores.
 
@@ -21,18 +36,27 @@ class Song:
     :param scores: the list of scores for the song (sorted)
     :type scores: list of Score instances
     """
+    __slots__ = ('_leaderboardId', '_scores', '_has_redundencies', '_is_sorted', '__level', '__title')
+
     def __init__(self, leaderboardId, scores):
-        self._leaderboardId = leaderboardId
+        # The same IDs appear in all the LeaderBoards, so they are interned
+        self._leaderboardId = sys.intern(leaderboardId)
         self._scores = scores
         # To avoid to clean often the list of scores,
         #   this boolean enables us to track if the current
         #   list of scores has some redundencies.
         self._has_redundencies = False
+        # Track if the list of scores is known to be sorted,
+        #   to avoid to sort it again when it is cleaned.
+        self._is_sorted = False
         
         # Cache
-        is_of_level = lambda lvl: (self._leaderboardId[-len(lvl):] == lvl)
-        self.__level = list(filter(is_of_level, Level.get_all()))[0]
-        self.__title = self._leaderboardId[len('Quest'):-len(self.__level)]
+        try:
+            self.__title, self.__level = _LEADERBOARD_ID_CACHE[leaderboardId]
+        except KeyError:
+            match = _LEADERBOARD_ID_RE.match(leaderboardId)
+            assert match is not None, 'Unknown level for the song "{}".'.format(leaderboardId)
+            self.__title, self.__level = _LEADERBOARD_ID_CACHE[leaderboardId] = match.groups()
     
     ### Getters
     def get_leaderboardId(self):
@@ -92,14 +116,7 @@ class Song:
 
         :rtype: dict{string => integer}
         """
-        players = {}
-        for score in self.get_scores():
-            name = score.get_player()
-            try:
-                players[name] += 1
-            except KeyError:
-                players[name] = 1
-        return players
+        return dict(Counter(score._playerName for score in self.get_scores()))
     
     ### Setters
     def add_scores(self, scores, *args):
@@ -111,27 +128,37 @@ class Song:
         :type scores: list of Score instances
         """
         # Get the list of scores
-        try:
-            _ = (e for e in scores)
-            assert len(args) == 0, 'If the first argument is iterable, it must be the only argument.'
-        except TypeError:
+        if isinstance(scores, Score):
             scores = [scores] + list(args)
-        # Checking
-        for score in scores:
-            assert isinstance(score, Score)
+        else:
+            assert len(args) == 0, 'If the first argument is iterable, it must be the only argument.'
+            if not isinstance(scores, (list, tuple)):
+                scores = list(scores)
+        # Checking (skipped with "python -O")
+        if __debug__:
+            for score in scores:
+                assert isinstance(score, Score)
         # Adding
-        for score in scores:
-            self._scores.append(score)
+        self._scores.extend(scores)
         self._has_redundencies = True
+        self._is_sorted = False
         
     def add_score(self, score):
         """ Add a Score instance in the song LeaderBoard.
-        See ``add_scores`` for more details.
+        If the scores are already sorted and without redundancies, the score
+        is directly inserted at its position. Otherwise, see ``add_scores``.
 
         :param score: the added score
         :type score: a Score instance
         """
-        self.add_scores([score])
+        if self._has_redundencies or not self._is_sorted:
+            self.add_scores([score])
+            return
+
+        assert isinstance(score, Score)
+        pos = bisect.bisect_left(self._scores, score)
+        if (pos == len(self._scores)) or (self._scores[pos] != score):
+            self._scores.insert(pos, score)
         
     def __add__(self, other):
         """ Add the scores of two LeaderBoards of the same song.
@@ -143,16 +170,33 @@ class Song:
         leadboardId = self.get_leaderboardId()
         assert leadboardId == other.get_leaderboardId()
         
-        song = Song(leadboardId, [])
-        song.add_scores(self._scores + other._scores)
+        # The sort detects the already sorted runs of scores
+        #   and merges them in linear time.
+        song = Song(leadboardId, sorted(self._scores + other._scores, key=Song._score_key))
+        song._is_sorted = True
+        song._has_redundencies = True
         return song
    
     ### Utility
+    # Key used to sort the scores, evaluated in C
+    _score_key = operator.attrgetter('_sort_key')
+
+    def _copy(self):
+        """ Return a new Song with the same scores.
+        """
+        song = Song(self._leaderboardId, list(self._scores))
+        song._is_sorted = self._is_sorted
+        song._has_redundencies = self._has_redundencies
+        return song
+
     def _clean_scores(self):
         """ Sort the scores and remove the redundancies.
         """
-        if self._has_redundencies:
-            self._scores.sort()
+        if self._has_redundencies or not self._is_sorted:
+            # If the scores are already sorted, only the
+            #   redundancies need to be removed.
+            if not self._is_sorted:
+                self._scores.sort(key=Song._score_key)
 
             scores = []
             for score in self._scores:
@@ -160,6 +204,7 @@ class Song:
                     scores.append(score)
 
             self._scores = scores
+            self._is_sorted = True
             self._has_redundencies = False
 
     ### Display functions
@@ -200,9 +245,7 @@ class Song:
 
         :param name: the player name which will be removed
         """
-        for i, score in reversed(list(enumerate(self._scores))):
-            if score.get_player() == name:
-                self._scores.pop(i)
+        self._scores = [score for score in self._scores if score._playerName != name]
             
     def keep_best(self, keep_FC=True, name=None):
         """ Clean the LeaderBoard by keeping the best score for
@@ -218,23 +261,25 @@ class Song:
         """
         self._clean_scores()
 
-        rmv_idxs = []
+        # The scores are sorted, so the first score of
+        #   each player is the best one.
+        kept = []
         already = {}
-        for i, score in enumerate(self._scores):
+        for score in self._scores:
             cname = score.get_player()
             fullcombo = score.is_fullCombo()
             if (name is not None) and (cname!=name):
+                kept.append(score)
                 continue
             
             if cname not in already:
                 already[cname] = fullcombo
+                kept.append(score)
             elif (keep_FC and not already[cname] and fullcombo):
                 already[cname] = True
-            else:
-                rmv_idxs.append(i)
-        rmv_idxs.reverse()
-        for i in rmv_idxs:
-            self._scores.pop(i)
+                kept.append(score)
+        self._scores = kept
+        self._is_sorted = True
             
     def truncate(self, limit=10):
         """ Truncate the song leaderboard. Only the best scores
@@ -247,6 +292,7 @@ class Song:
         scores = self.get_scores()
         too_much = scores[limit:]
         self._scores = scores[:limit]
+        self._is_sorted = True
         return too_much
         
     def is_valid(self):
@@ -264,11 +310,13 @@ class Song:
         :type names: list of string
         :rtype: a Song instance
         """
-        criteria = lambda score: (score.get_player() in names)
-        return Song(
+        song = Song(
             self._leaderboardId,
-            list(filter(criteria, self._scores))
+            [score for score in self._scores if score._playerName in names]
         )
+        song._is_sorted = self._is_sorted
+        song._has_redundencies = self._has_redundencies
+        return song
 
     ### Misc
     @classmethod